@@ -42,6 +42,9 @@ class McpToolConfig(BaseModel):
     command: str
     args: list[str]
     env: dict[str, str]
+    # Port the server listens on when started in SSE mode, see
+    # MCPToolCallSandboxHost.add_stdio_client_as_sse
+    sse_port: Optional[int] = None
 
 
 class Manus(ReActAgent):
@@ -152,6 +155,7 @@ class Manus(ReActAgent):
                             "command": tool.command,
                             "args": tool.args,
                             "env": tool.env,
+                            "sse_port": tool.sse_port,
                         }
                     )
 
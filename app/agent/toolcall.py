@@ -11,7 +11,7 @@ from app.logger import logger
 from app.schema import TOOL_CHOICE_TYPE, AgentState, Message, ToolCall, ToolChoice
 from app.tool import CreateChatCompletion, Terminate, ToolCollection
 from app.tool.base import BaseTool
-from app.tool.mcp_sandbox import MCPToolCallSandboxHost
+from app.tool.mcp_sandbox import MCPSandboxClients, MCPToolCallSandboxHost
 
 # Avoid circular import if BrowserAgent needs BrowserContextHelper
 if TYPE_CHECKING:
@@ -59,23 +59,38 @@ class ToolCallContextHelper:
 
     async def add_mcp(self, tool: dict) -> None:
         """Add a new MCP client to the available tools collection."""
-        if isinstance(tool, dict) and "client_id" in tool and "server_url" in tool:
-            await self.mcp.add_sse_client(tool["client_id"], tool["server_url"])
-            client = self.mcp.get_client(tool["client_id"])
-            if client:
-                for mcp_tool in client.tool_map.values():
-                    self.available_tools.add_tool(mcp_tool)
-        elif isinstance(tool, dict) and "client_id" in tool and "command" in tool:
-            await self.mcp.add_stdio_client(
+        if not isinstance(tool, dict) or "client_id" not in tool:
+            return
+
+        if "server_url" in tool:
+            client = await self.mcp.add_sse_client(
+                tool["client_id"], tool["server_url"]
+            )
+        elif "command" in tool and tool.get("sse_port"):
+            # The server supports SSE, run it once and keep the stream alive
+            client = await self.mcp.add_stdio_client_as_sse(
                 tool["client_id"],
                 tool["command"],
                 tool.get("args", []),
                 tool.get("env", {}),
+                port=tool["sse_port"],
             )
-            client = self.mcp.get_client(tool["client_id"])
-            if client:
-                for mcp_tool in client.tool_map.values():
-                    self.available_tools.add_tool(mcp_tool)
+        elif "command" in tool:
+            client = await self.mcp.add_stdio_client(
+                tool["client_id"],
+                tool["command"],
+                tool.get("args", []),
+                tool.get("env", {}),
+            )
+        else:
+            return
+
+        self._add_mcp_client_tools(client)
+
+    def _add_mcp_client_tools(self, client: MCPSandboxClients) -> None:
+        """Expose all tools of a connected MCP client to the agent."""
+        for mcp_tool in client.tool_map.values():
+            self.available_tools.add_tool(mcp_tool)
 
     async def ask_tool(self) -> bool:
         """Process current state and decide next actions using tools"""
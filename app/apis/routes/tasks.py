@@ -18,6 +18,9 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 AGENT_NAME = "Manus"
 
+# Upper bound for a single agent run, in seconds
+TASK_TIMEOUT = 3600
+
 
 async def handle_agent_event(task_id: str, event_name: str, step: int, **kwargs):
     """Handle agent events and update task status.
@@ -63,7 +66,18 @@ async def run_task(task_id: str, prompt: str):
             )
 
         # Run the agent
-        await agent.run(prompt)
+        try:
+            await asyncio.wait_for(agent.run(prompt), timeout=TASK_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"Task {task_id} timed out after {TASK_TIMEOUT} seconds")
+            # The cancelled run emits no lifecycle end event, so end the
+            # event streams here
+            await task_manager.update_task_progress(
+                task_id=task_id,
+                event_name=BaseAgentEvents.LIFECYCLE_TERMINATED,
+                step=agent.current_step,
+                error=f"Task timed out after {TASK_TIMEOUT} seconds",
+            )
         await agent.cleanup()
 
         # Ensure all events have been processed
@@ -92,7 +106,10 @@ async def event_generator(task_id: str):
             # Send actual event data
             if event.get("type"):
                 yield f"data: {formatted_event}\n\n"
-                if event.get("event_name") == BaseAgentEvents.LIFECYCLE_COMPLETE:
+                if event.get("event_name") in (
+                    BaseAgentEvents.LIFECYCLE_COMPLETE,
+                    BaseAgentEvents.LIFECYCLE_TERMINATED,
+                ):
                     break
 
             # Send heartbeat
@@ -97,6 +97,16 @@ class SandboxSettings(BaseModel):
     network_enabled: bool = Field(
         False, description="Whether network access is allowed"
     )
+    use_agent_server: bool = Field(
+        False,
+        description=(
+            "Run commands through an in-container unix socket server instead of "
+            "a pty. Each command runs in a fresh shell, so shell state such as "
+            "cd or export does not persist between commands. Requires OpenManus "
+            "to run on the Docker host, as the socket directory is bind mounted "
+            "from the host"
+        ),
+    )
 
 
 class MCPSettings(BaseModel):
@@ -105,6 +115,22 @@ class MCPSettings(BaseModel):
     server_reference: str = Field(
         "app.mcp.server", description="Module reference for the MCP server"
     )
+    prewarm_sandbox_images: bool = Field(
+        False,
+        description="Pull missing uvx/npx sandbox images in the background when an agent is created",
+    )
+    share_docker_package_caches: bool = Field(
+        False,
+        description="Mount the shared pip/npm cache volumes into docker MCP server containers",
+    )
+    sandbox_pool_size: int = Field(
+        4,
+        description="Maximum pooled sandbox containers per uvx/npx command type, 0 disables the pool",
+    )
+    sandbox_network: Optional[str] = Field(
+        None,
+        description="Docker network SSE sandbox containers join, defaults to the network of the OpenManus container",
+    )
 
 
 class AppConfig(BaseModel):
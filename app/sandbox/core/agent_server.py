@@ -0,0 +1,91 @@
+"""
+Sandbox Agent Server
+
+Standalone command server that runs inside a sandbox container. It listens on
+a unix domain socket and executes one shell command per request, replying with
+length-prefixed frames so the host never has to scan output for prompts.
+
+Request:  4B length | command
+Response: 4B return code | 4B stdout length | stdout | 4B stderr length | stderr
+
+This file is copied into the container as-is, so it must only depend on the
+standard library.
+
+Usage:
+    python3 -u agent_server.py <socket_path> [working_dir]
+"""
+
+import os
+import socketserver
+import struct
+import subprocess
+import sys
+
+
+_LEN = struct.Struct("!I")
+_RC = struct.Struct("!i")
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    """Receives exactly `size` bytes, or returns b"" if the peer disconnected."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return b""
+        data += chunk
+    return bytes(data)
+
+
+class CommandHandler(socketserver.BaseRequestHandler):
+    """Serves framed command requests for a single client connection."""
+
+    def handle(self) -> None:
+        while True:
+            header = _recv_exactly(self.request, _LEN.size)
+            if not header:
+                return
+
+            (length,) = _LEN.unpack(header)
+            command = _recv_exactly(self.request, length).decode("utf-8")
+
+            result = subprocess.run(
+                command,
+                shell=True,
+                executable="/bin/bash",
+                cwd=self.server.working_dir,
+                capture_output=True,
+            )
+            self.request.sendall(
+                _RC.pack(result.returncode)
+                + _LEN.pack(len(result.stdout))
+                + result.stdout
+                + _LEN.pack(len(result.stderr))
+                + result.stderr
+            )
+
+
+class AgentServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, working_dir: str) -> None:
+        self.working_dir = working_dir
+        super().__init__(socket_path, CommandHandler)
+
+
+def main() -> None:
+    socket_path = sys.argv[1]
+    working_dir = sys.argv[2] if len(sys.argv) > 2 else "/"
+
+    os.makedirs(working_dir, exist_ok=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with AgentServer(socket_path, working_dir) as server:
+        # The host side may run as a non-root user
+        os.chmod(socket_path, 0o666)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import asyncio
 import io
 import os
+import shutil
 import tarfile
 import tempfile
 import uuid
@@ -12,7 +13,11 @@ from docker.models.containers import Container
 
 from app.config import SandboxSettings
 from app.sandbox.core.exceptions import SandboxTimeoutError
-from app.sandbox.core.terminal import AsyncDockerizedTerminal
+from app.sandbox.core.terminal import (
+    AGENT_SOCKET_DIR,
+    AGENT_SOCKET_NAME,
+    AsyncDockerizedTerminal,
+)
 
 
 class DockerSandbox:
@@ -45,6 +50,7 @@ class DockerSandbox:
         self.client = docker.from_env()
         self.container: Optional[Container] = None
         self.terminal: Optional[AsyncDockerizedTerminal] = None
+        self.agent_socket_dir: Optional[str] = None
 
     async def create(self) -> "DockerSandbox":
         """Creates and starts the sandbox container.
@@ -91,8 +97,13 @@ class DockerSandbox:
             self.terminal = AsyncDockerizedTerminal(
                 container["Id"],
                 self.config.work_dir,
-                env_vars={"PYTHONUNBUFFERED": "1"}
+                env_vars={"PYTHONUNBUFFERED": "1"},
                 # Ensure Python output is not buffered
+                agent_socket=(
+                    os.path.join(self.agent_socket_dir, AGENT_SOCKET_NAME)
+                    if self.agent_socket_dir
+                    else None
+                ),
             )
             await self.terminal.init()
 
@@ -114,6 +125,11 @@ class DockerSandbox:
         work_dir = self._ensure_host_dir(self.config.work_dir)
         bindings[work_dir] = {"bind": self.config.work_dir, "mode": "rw"}
 
+        # Share a host directory for the agent server socket
+        if self.config.use_agent_server:
+            self.agent_socket_dir = self._ensure_host_dir(AGENT_SOCKET_DIR)
+            bindings[self.agent_socket_dir] = {"bind": AGENT_SOCKET_DIR, "mode": "rw"}
+
         # Add custom volume bindings
         for host_path, container_path in self.volume_bindings.items():
             bindings[host_path] = {"bind": container_path, "mode": "rw"}
@@ -447,6 +463,14 @@ class DockerSandbox:
                 finally:
                     self.container = None
 
+            if self.agent_socket_dir:
+                try:
+                    await asyncio.to_thread(shutil.rmtree, self.agent_socket_dir)
+                except Exception as e:
+                    errors.append(f"Agent socket directory removal error: {e}")
+                finally:
+                    self.agent_socket_dir = None
+
         except Exception as e:
             errors.append(f"General cleanup error: {e}")
 
@@ -6,15 +6,66 @@ allowing interactive command execution with timeout control.
 """
 
 import asyncio
+import functools
+import os
 import re
+import shlex
+import shutil
 import socket
-from typing import Dict, Optional, Tuple, Union
+import struct
+from typing import Dict, Optional, Union
 
 import docker
-from docker import APIClient
 from docker.errors import APIError
 from docker.models.containers import Container
 
+from app.logger import logger
+
+
+# Invariant parts of the interactive bash startup, shared by every session
+_STARTUP_PREFIX = ("bash", "-c")
+_STARTUP_ENV_CONST = {"TERM": "dumb", "PS1": "$ ", "PROMPT_COMMAND": ""}
+
+# Specific risky commands rejected by DockerSession._sanitize_command
+_RISKY_RE = re.compile(
+    "|".join(
+        re.escape(risky)
+        for risky in (
+            "rm -rf /",
+            "mkfs",
+            "dd if=/dev/zero",
+            ":(){:|:&};:",
+            "chmod -R 777 /",
+            "chown -R",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+# Backoff delays (seconds) while waiting for the exec instance to exit on close
+_CLOSE_POLL_DELAYS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.2)
+
+# Container directory shared with the host for the agent server socket
+AGENT_SOCKET_DIR = "/run/openmanus"
+AGENT_SOCKET_NAME = "agent.sock"
+_AGENT_SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), "agent_server.py")
+
+_FRAME_LEN = struct.Struct("!I")
+_FRAME_RC = struct.Struct("!i")
+
+# Connection pool size of the shared Docker client, sized for concurrent terminals
+_DOCKER_POOL_SIZE = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_client() -> docker.DockerClient:
+    """Returns the process-wide Docker client.
+
+    docker-py clients are thread-safe, so every terminal and session reuses one
+    client and its HTTP connection pool instead of building their own.
+    """
+    return docker.from_env(max_pool_size=_DOCKER_POOL_SIZE)
+
 
 class DockerSession:
     def __init__(self, container_id: str) -> None:
@@ -23,7 +74,7 @@ class DockerSession:
         Args:
             container_id: ID of the Docker container.
         """
-        self.api = APIClient()
+        self.api = _shared_client().api
         self.container_id = container_id
         self.exec_id = None
         self.socket = None
@@ -39,9 +90,8 @@ class DockerSession:
             RuntimeError: If socket connection fails.
         """
         startup_command = [
-            "bash",
-            "-c",
-            f"cd {working_dir} && "
+            *_STARTUP_PREFIX,
+            f"cd {shlex.quote(working_dir)} && "
             "PROMPT_COMMAND='' "
             "PS1='$ ' "
             "exec bash --norc --noprofile",
@@ -56,7 +106,7 @@ class DockerSession:
             stderr=True,
             privileged=True,
             user="root",
-            environment={**env_vars, "TERM": "dumb", "PS1": "$ ", "PROMPT_COMMAND": ""},
+            environment={**env_vars, **_STARTUP_ENV_CONST},
         )
         self.exec_id = exec_data["Id"]
 
@@ -91,20 +141,23 @@ class DockerSession:
 
                 # Close socket connection
                 try:
-                    self.socket.shutdown(socket.SHUT_RDWR)
+                    await asyncio.to_thread(self.socket.shutdown, socket.SHUT_RDWR)
                 except:
                     pass  # Some platforms may not support shutdown
 
-                self.socket.close()
+                await asyncio.to_thread(self.socket.close)
                 self.socket = None
 
             if self.exec_id:
                 try:
-                    # Check exec instance status
-                    exec_inspect = self.api.exec_inspect(self.exec_id)
-                    if exec_inspect.get("Running", False):
-                        # If still running, wait for it to complete
-                        await asyncio.sleep(0.5)
+                    # Poll exec instance status with backoff until it stops
+                    for delay in _CLOSE_POLL_DELAYS:
+                        exec_inspect = await asyncio.to_thread(
+                            self.api.exec_inspect, self.exec_id
+                        )
+                        if not exec_inspect.get("Running", False):
+                            break
+                        await asyncio.sleep(delay)
                 except:
                     pass  # Ignore inspection errors, continue cleanup
 
@@ -112,7 +165,7 @@ class DockerSession:
 
         except Exception as e:
             # Log error but don't raise, ensure cleanup continues
-            print(f"Warning: Error during session cleanup: {e}")
+            logger.warning("Error during session cleanup: {}", e)
 
     async def _read_until_prompt(self) -> str:
         """Reads output until prompt is found.
@@ -198,10 +251,12 @@ class DockerSession:
                             continue
                         raise
 
-                output = b"\n".join(result_lines).decode("utf-8")
-                output = re.sub(r"\n\$ echo \$\$?.*$", "", output)
+                # The exit-code probe is echoed back after the prompt as the
+                # final line; drop it here instead of scanning the output.
+                if len(result_lines) > 1 and result_lines[-1].startswith(b"$ echo $"):
+                    result_lines.pop()
 
-                return output
+                return b"\n".join(result_lines).decode("utf-8")
 
             if timeout:
                 result = await asyncio.wait_for(read_output(), timeout)
@@ -215,7 +270,8 @@ class DockerSession:
         except Exception as e:
             raise RuntimeError(f"Failed to execute command: {e}")
 
-    def _sanitize_command(self, command: str) -> str:
+    @staticmethod
+    def _sanitize_command(command: str) -> str:
         """Sanitizes the command string to prevent shell injection.
 
         Args:
@@ -227,25 +283,110 @@ class DockerSession:
         Raises:
             ValueError: If command contains potentially dangerous patterns.
         """
+        match = _RISKY_RE.search(command)
+        if match:
+            raise ValueError(
+                f"Command contains potentially dangerous operation: {match.group(0)}"
+            )
 
-        # Additional checks for specific risky commands
-        risky_commands = [
-            "rm -rf /",
-            "rm -rf /*",
-            "mkfs",
-            "dd if=/dev/zero",
-            ":(){:|:&};:",
-            "chmod -R 777 /",
-            "chown -R",
-        ]
+        return command
 
-        for risky in risky_commands:
-            if risky in command.lower():
-                raise ValueError(
-                    f"Command contains potentially dangerous operation: {risky}"
-                )
 
-        return command
+class AgentSession:
+    def __init__(self, socket_path: str) -> None:
+        """Initializes a session with the in-container agent server.
+
+        Args:
+            socket_path: Host path of the agent server's unix socket.
+        """
+        self.socket_path = socket_path
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def create(self, timeout: float = 10.0) -> None:
+        """Connects to the agent server, waiting for it to start listening.
+
+        Args:
+            timeout: Maximum time to wait for the server in seconds.
+
+        Raises:
+            RuntimeError: If the server does not accept connections in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                await self._connect()
+                return
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                if loop.time() >= deadline:
+                    raise RuntimeError(f"Agent server not available: {e}")
+                await asyncio.sleep(0.05)
+
+    async def _connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path)
+
+    async def close(self) -> None:
+        """Closes the connection to the agent server."""
+        if self.writer:
+            try:
+                self.writer.close()
+                await self.writer.wait_closed()
+            except Exception as e:
+                logger.warning("Error during session cleanup: {}", e)
+            finally:
+                self.reader = None
+                self.writer = None
+
+    async def _read_response(self) -> str:
+        """Reads one framed response and returns the combined output."""
+        header = await self.reader.readexactly(_FRAME_RC.size + _FRAME_LEN.size)
+        stdout_len = _FRAME_LEN.unpack_from(header, _FRAME_RC.size)[0]
+        stdout = await self.reader.readexactly(stdout_len)
+        (stderr_len,) = _FRAME_LEN.unpack(
+            await self.reader.readexactly(_FRAME_LEN.size)
+        )
+        stderr = await self.reader.readexactly(stderr_len)
+        return (stdout + stderr).decode("utf-8")
+
+    async def execute(self, command: str, timeout: Optional[int] = None) -> str:
+        """Executes a command through the agent server.
+
+        Args:
+            command: Shell command to execute.
+            timeout: Maximum execution time in seconds.
+
+        Returns:
+            Combined stdout and stderr of the command.
+
+        Raises:
+            RuntimeError: If execution fails.
+            TimeoutError: If command execution exceeds timeout.
+        """
+        try:
+            if not self.writer:
+                await self._connect()
+
+            payload = DockerSession._sanitize_command(command).encode()
+            self.writer.write(_FRAME_LEN.pack(len(payload)) + payload)
+            await self.writer.drain()
+
+            if timeout:
+                result = await asyncio.wait_for(self._read_response(), timeout)
+            else:
+                result = await self._read_response()
+
+            return result.strip()
+
+        except asyncio.TimeoutError:
+            # The pending response would desynchronize the stream, so reconnect
+            # on the next command instead of reusing this connection.
+            await self.close()
+            raise TimeoutError(f"Command execution timed out after {timeout} seconds")
+        except Exception as e:
+            # The connection may be broken, e.g. if the server died
+            await self.close()
+            raise RuntimeError(f"Failed to execute command: {e}")
 
 
 class ProcessWrapper:
@@ -302,6 +443,7 @@ class AsyncDockerizedTerminal:
         working_dir: str = "/workspace",
         env_vars: Optional[Dict[str, str]] = None,
         default_timeout: int = 60,
+        agent_socket: Optional[str] = None,
     ) -> None:
         """Initializes an asynchronous terminal for Docker containers.
 
@@ -310,8 +452,11 @@ class AsyncDockerizedTerminal:
             working_dir: Working directory inside the container.
             env_vars: Environment variables to set.
             default_timeout: Default command execution timeout in seconds.
+            agent_socket: Host path of the agent server socket. The directory
+                must be mounted at AGENT_SOCKET_DIR in the container. When
+                set, commands run through the agent server instead of a pty.
         """
-        self.client = docker.from_env()
+        self.client = _shared_client()
         self.container = (
             container
             if isinstance(container, Container)
@@ -320,45 +465,74 @@ class AsyncDockerizedTerminal:
         self.working_dir = working_dir
         self.env_vars = env_vars or {}
         self.default_timeout = default_timeout
+        self.agent_socket = agent_socket
         self.session = None
+        self._reader_fd: Optional[int] = None
 
     async def init(self) -> None:
         """Initializes the terminal environment.
 
-        Ensures working directory exists and creates an interactive session.
+        Creates an interactive session first, then ensures the working
+        directory exists and enters it through that same session, so no
+        separate Docker exec is needed.
 
         Raises:
             RuntimeError: If initialization fails.
         """
-        await self._ensure_workdir()
+        if self.agent_socket:
+            await self._start_agent_server()
+            self.session = AgentSession(self.agent_socket)
+            await self.session.create()
+            return
 
         self.session = DockerSession(self.container.id)
-        await self.session.create(self.working_dir, self.env_vars)
+        await self.session.create("/tmp", self.env_vars)
+        await self._ensure_workdir()
 
-    async def _ensure_workdir(self) -> None:
-        """Ensures working directory exists in container.
+    async def _start_agent_server(self) -> None:
+        """Copies the agent server into the shared socket directory and starts it.
 
         Raises:
-            RuntimeError: If directory creation fails.
+            RuntimeError: If the server cannot be started.
         """
+        socket_dir = os.path.dirname(self.agent_socket)
+        await asyncio.to_thread(shutil.copy, _AGENT_SERVER_SCRIPT, socket_dir)
+
         try:
-            await self._exec_simple(f"mkdir -p {self.working_dir}")
+            await asyncio.to_thread(
+                self.container.exec_run,
+                [
+                    "python3",
+                    "-u",
+                    f"{AGENT_SOCKET_DIR}/agent_server.py",
+                    f"{AGENT_SOCKET_DIR}/{os.path.basename(self.agent_socket)}",
+                    self.working_dir,
+                ],
+                environment=self.env_vars,
+                detach=True,
+            )
         except APIError as e:
-            raise RuntimeError(f"Failed to create working directory: {e}")
-
-    async def _exec_simple(self, cmd: str) -> Tuple[int, str]:
-        """Executes a simple command using Docker's exec_run.
+            raise RuntimeError(f"Failed to start agent server: {e}")
 
-        Args:
-            cmd: Command to execute.
+    async def _ensure_workdir(self) -> None:
+        """Ensures working directory exists and makes it the session's cwd.
 
-        Returns:
-            Tuple of (exit_code, output).
+        Raises:
+            RuntimeError: If the directory cannot be created or entered.
         """
-        result = await asyncio.to_thread(
-            self.container.exec_run, cmd, environment=self.env_vars
-        )
-        return result.exit_code, result.output.decode("utf-8")
+        workdir = shlex.quote(self.working_dir)
+        try:
+            output = await self.session.execute(
+                f"mkdir -p {workdir} && cd {workdir} && echo ok"
+            )
+        except RuntimeError as e:
+            raise RuntimeError(f"Failed to create working directory: {e}")
+
+        # The output can also contain echoed prompt lines, look for the marker
+        if "ok" not in (line.strip() for line in output.splitlines()):
+            raise RuntimeError(
+                f"Failed to enter working directory {self.working_dir}: {output}"
+            )
 
     async def run_command(self, cmd: str, timeout: Optional[int] = None) -> str:
         """Runs a command in the container with timeout.
@@ -392,6 +566,8 @@ class AsyncDockerizedTerminal:
         """
         if not self.session:
             raise RuntimeError("Terminal not initialized")
+        if isinstance(self.session, AgentSession):
+            raise RuntimeError("Interactive processes require a pty session")
 
         # Create input and output queues
         stdin_queue = asyncio.Queue()
@@ -423,46 +599,53 @@ class AsyncDockerizedTerminal:
             sanitized_cmd = self.session._sanitize_command(cmd)
             self.session.socket.sendall(f"{sanitized_cmd}\n".encode())
 
-            # Start two tasks: one for reading process output, one for writing process input
-            read_task = asyncio.create_task(self._read_process_output(stdout_queue))
-            write_task = asyncio.create_task(self._write_process_input(stdin_queue))
+            # Drain process output whenever the socket becomes readable
+            self._reader_fd = self.session.socket.fileno()
+            asyncio.get_running_loop().add_reader(
+                self._reader_fd, self._drain_ready, stdout_queue
+            )
 
-            # Wait for both tasks to complete
-            await asyncio.gather(read_task, write_task)
+            # Forward process input until cancelled
+            await self._write_process_input(stdin_queue)
 
         except Exception as e:
             # When an error occurs, make sure to send the error message to the queue
             error_msg = f"Process error: {str(e)}".encode()
             await stdout_queue.put(error_msg)
-
-    async def _read_process_output(self, output_queue: asyncio.Queue):
-        """Reads output from the process and puts it into the queue"""
-        if not self.session or not self.session.socket:
-            return
-
-        try:
-            while True:
-                try:
-                    # Non-blocking read from socket
-                    chunk = self.session.socket.recv(4096)
-                    if not chunk:
-                        # Connection closed
-                        break
-
-                    await output_queue.put(chunk)
-                except socket.error as e:
-                    if e.errno == socket.EWOULDBLOCK:
-                        # No data to read, wait a bit and try again
-                        await asyncio.sleep(0.1)
-                        continue
-                    raise
-        except asyncio.CancelledError:
-            # Task was cancelled
-            pass
-        except Exception as e:
-            # Other errors
-            error_msg = f"Read error: {str(e)}".encode()
-            await output_queue.put(error_msg)
+        finally:
+            # Stop draining the session socket into this process's queue, so
+            # later commands get their output back
+            self._remove_reader()
+
+    def _drain_ready(self, output_queue: asyncio.Queue) -> None:
+        """Reads everything buffered on the socket and queues it as one chunk"""
+        buffer = bytearray()
+        closed = False
+        while True:
+            try:
+                chunk = self.session.socket.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                output_queue.put_nowait(f"Read error: {str(e)}".encode())
+                closed = True
+                break
+            if not chunk:
+                # Connection closed
+                closed = True
+                break
+            buffer += chunk
+
+        if buffer:
+            output_queue.put_nowait(bytes(buffer))
+        if closed:
+            self._remove_reader()
+
+    def _remove_reader(self) -> None:
+        """Stops watching the session socket for process output"""
+        if self._reader_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._reader_fd)
+            self._reader_fd = None
 
     async def _write_process_input(self, input_queue: asyncio.Queue):
         """Gets data from the queue and writes it to the process"""
@@ -484,10 +667,11 @@ class AsyncDockerizedTerminal:
             pass
         except Exception as e:
             # Other errors, log but don't raise
-            print(f"Write error: {str(e)}")
+            logger.warning("Write error: {}", e)
 
     async def close(self) -> None:
         """Closes the terminal session."""
+        self._remove_reader()
         if self.session:
             await self.session.close()
 
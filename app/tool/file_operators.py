@@ -1,7 +1,9 @@
 """File operation interfaces and implementations for local and sandbox environments."""
 
 import asyncio
+import functools
 import os
+import shlex
 from pathlib import Path
 from typing import Optional, Protocol, Tuple, Union, runtime_checkable
 
@@ -12,6 +14,17 @@ from app.sandbox.client import SANDBOX_CLIENT
 PathLike = Union[str, Path]
 
 
+@functools.lru_cache(maxsize=4096)
+def _normalize_path(base_path: str, path: str) -> Path:
+    """Map a /workspace path onto base_path, converting Windows-style separators."""
+    path_str = path.replace("\\", "/")
+
+    if not path_str.startswith("/workspace"):
+        raise ToolError(f"Path {path_str} is not a valid path")
+
+    return Path(base_path) / path_str.replace("/workspace/", "")
+
+
 @runtime_checkable
 class FileOperator(Protocol):
     """Interface for file operations in different environments."""
@@ -32,6 +45,10 @@ class FileOperator(Protocol):
         """Check if path exists."""
         ...
 
+    async def probe(self, path: PathLike) -> Tuple[bool, bool]:
+        """Return (exists, is_directory) for a path in one call."""
+        ...
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -47,16 +64,7 @@ class LocalFileOperator(FileOperator):
 
     def _resolve_path(self, path: PathLike) -> Path:
         """Resolve path relative to base_path."""
-        # Convert Windows-style path to POSIX-style
-        path_str = str(path).replace("\\", "/")
-
-        if not path_str.startswith("/workspace"):
-            raise ToolError(f"Path {path_str} is not a valid path")
-
-        resolved = Path(self.base_path / path_str.replace("/workspace/", ""))
-        if not resolved.parent.exists():
-            os.makedirs(resolved.parent, exist_ok=True)
-        return resolved
+        return _normalize_path(str(self.base_path), str(path))
 
     async def read_file(self, path: PathLike) -> str:
         """Read content from a local file."""
@@ -70,6 +78,7 @@ class LocalFileOperator(FileOperator):
         """Write content to a local file."""
         try:
             resolved_path = self._resolve_path(path)
+            os.makedirs(resolved_path.parent, exist_ok=True)
             resolved_path.write_text(content, encoding=self.encoding)
         except Exception as e:
             raise ToolError(f"Failed to write to {path}: {str(e)}") from None
@@ -84,6 +93,13 @@ class LocalFileOperator(FileOperator):
         resolved_path = self._resolve_path(path)
         return resolved_path.exists()
 
+    async def probe(self, path: PathLike) -> Tuple[bool, bool]:
+        """Return (exists, is_directory) for a local path."""
+        resolved_path = self._resolve_path(path)
+        if resolved_path.is_dir():
+            return True, True
+        return resolved_path.exists(), False
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -154,6 +170,16 @@ class SandboxFileOperator(FileOperator):
         )
         return result.strip() == "true"
 
+    async def probe(self, path: PathLike) -> Tuple[bool, bool]:
+        """Return (exists, is_directory) with a single sandbox round trip."""
+        await self._ensure_sandbox_initialized()
+        quoted = shlex.quote(str(path))
+        result = await self.sandbox_client.run_command(
+            f"test -d {quoted} && echo d || (test -e {quoted} && echo f || echo n)"
+        )
+        kind = result.strip()
+        return kind in ("d", "f"), kind == "d"
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
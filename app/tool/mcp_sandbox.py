@@ -1,7 +1,16 @@
+import asyncio
+import atexit
+import os
+import re
+import shlex
+import socket
 import time
+from collections import defaultdict
 from contextlib import AsyncExitStack
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+import docker
+from docker.errors import ImageNotFound, NotFound
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
@@ -13,6 +22,471 @@ from app.tool.base import BaseTool, ToolResult
 from app.tool.tool_collection import ToolCollection
 
 
+SANDBOX_IMAGES = {
+    "uvx": "iheytang/openmanus-sandbox-uvenv:latest",
+    "npx": "iheytang/openmanus-sandbox-nodejs:latest",
+}
+
+# Package cache volumes persisted between container runs
+SANDBOX_CACHE_VOLUMES = {
+    "uvx": [
+        "openmanus-pip-cache:/root/.cache/pip",
+        "openmanus-uv-cache:/root/.cache/uv",
+    ],
+    "npx": [
+        "openmanus-npm-cache:/root/.npm",
+        "openmanus-yarn-cache:/usr/local/share/.cache/yarn",
+    ],
+}
+
+SANDBOX_ENV_VARS = {
+    "PYTHONUNBUFFERED": "1",  # Ensure Python output is not buffered
+    "TERM": "dumb",  # Use dumb terminal type
+    "PS1": "$ ",  # Set a simple prompt
+    "PROMPT_COMMAND": "",  # Disable prompt command
+    "UV_INDEX_URL": "https://mirrors.aliyun.com/pypi/simple/",
+    "NPM_REGISTRY": "https://registry.npmmirror.com",
+}
+
+
+# Network SSE sandbox containers join when none is configured and OpenManus
+# does not run in a container
+SANDBOX_NETWORK = "openmanus-container-network"
+
+_EMPTY: Tuple = ()
+
+# Replaces characters that are not allowed in container names
+_SANITIZE = re.compile(r"[^A-Za-z0-9]").sub
+
+_COMMAND_TYPES = {"uvx": "uvx", "npx": "npx", "docker": "docker"}
+
+# Precomputed docker CLI flags that never change between invocations
+_STATIC_ENV_ARGS = tuple(
+    flag for key, value in SANDBOX_ENV_VARS.items() for flag in ("-e", f"{key}={value}")
+)
+_CACHE_MOUNT_ARGS = {
+    command_type: tuple(flag for volume in volumes for flag in ("-v", volume))
+    for command_type, volumes in SANDBOX_CACHE_VOLUMES.items()
+}
+_SHARED_CACHE_MOUNT_ARGS = (
+    "-v",
+    "openmanus-pip-cache:/root/.cache/pip",
+    "-v",
+    "openmanus-npm-cache:/root/.npm",
+)
+
+
+def _build_docker_args(
+    command_type: str,
+    command: str,
+    args: Tuple[str, ...],
+    env: Tuple[Tuple[str, str], ...],
+    pooled_container_id: Optional[str],
+    host_workspace_root: str,
+    share_package_caches: bool,
+) -> Tuple[str, ...]:
+    """Build the docker CLI arguments that run an MCP server command."""
+    # For docker commands, use the original parameters directly
+    if command_type == "docker":
+        docker_args = ["run"]
+
+        if "--rm" not in args:
+            docker_args.append("--rm")
+        if "-i" not in args:
+            docker_args.append("-i")
+
+        docker_args.extend(["-v", f"{host_workspace_root}:/workspace"])
+
+        # Opt in to sharing the package caches with user-supplied images
+        if share_package_caches:
+            docker_args.extend(_SHARED_CACHE_MOUNT_ARGS)
+
+        docker_args.extend([command, *args])
+        return tuple(docker_args)
+
+    # Reuse a warm pooled container, it already has the mounts and base env
+    if pooled_container_id:
+        docker_args = ["exec", "-i"]
+        for key, value in env:
+            docker_args.extend(["-e", f"{key}={value}"])
+        docker_args.extend([pooled_container_id, *shlex.split(command), *args])
+        return tuple(docker_args)
+
+    # Otherwise create a new container with --rm flag to ensure cleanup, with
+    # package cache volumes, the workspace mount, base and custom environment
+    # variables, and the image for the command type. The command is exec'd
+    # directly so arguments are passed through without shell quoting.
+    return (
+        "run",
+        "--rm",
+        "-i",
+        *_CACHE_MOUNT_ARGS[command_type],
+        "-v",
+        f"{host_workspace_root}:/workspace",
+        *_STATIC_ENV_ARGS,
+        *(flag for key, value in env for flag in ("-e", f"{key}={value}")),
+        SANDBOX_IMAGES[command_type],
+        *shlex.split(command),
+        *args,
+    )
+
+
+def _build_server_params(
+    command_type: str,
+    command: str,
+    args: Tuple[str, ...],
+    env: Tuple[Tuple[str, str], ...],
+    container_name: str,
+    pooled_container_id: Optional[str],
+    host_workspace_root: str,
+    share_package_caches: bool,
+) -> StdioServerParameters:
+    """Build the stdio parameters that run an MCP server command through docker."""
+    docker_args = _build_docker_args(
+        command_type,
+        command,
+        args,
+        env,
+        pooled_container_id,
+        host_workspace_root,
+        share_package_caches,
+    )
+    # Name containers we create so they can be found and stopped
+    if command_type != "docker" and not pooled_container_id:
+        docker_args = ("run", "--name", container_name, *docker_args[1:])
+    return StdioServerParameters(
+        command="docker",
+        args=list(docker_args),
+        # For docker commands, pass the original environment through
+        env=dict(env) if command_type == "docker" else None,
+    )
+
+
+# Labels identifying pooled containers and the process that started them
+_POOL_LABEL = "openmanus.sandbox.pool"
+_OWNER_LABEL = "openmanus.sandbox.owner"
+
+# Prints the PIDs of live processes in a container other than its init process
+# and the shell running this script. Zombies are skipped, they are not running.
+_LIST_PROCESSES = """
+for f in /proc/[0-9]*/stat; do
+  read -r stat < "$f" 2>/dev/null || continue
+  pid=${stat%% *}
+  state=${stat##*) }
+  state=${state%% *}
+  [ "$pid" = 1 ] || [ "$pid" = $$ ] || [ "$state" = Z ] || echo "$pid"
+done
+"""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+_DOCKER_CLIENT: Optional[docker.DockerClient] = None
+_DOCKER_CLIENT_LOCK = asyncio.Lock()
+
+
+async def _get_docker_client() -> docker.DockerClient:
+    """Return the Docker client shared by all sandbox MCP clients, creating it once."""
+    global _DOCKER_CLIENT
+    async with _DOCKER_CLIENT_LOCK:
+        if _DOCKER_CLIENT is None:
+            _DOCKER_CLIENT = await asyncio.to_thread(docker.from_env)
+    return _DOCKER_CLIENT
+
+
+async def _get_own_container():
+    """Return the container OpenManus runs in, or None if it runs on the host.
+
+    Docker sets a container's hostname to its ID, as docker-compose does for
+    the core container.
+    """
+    client = await _get_docker_client()
+    try:
+        return await asyncio.to_thread(client.containers.get, socket.gethostname())
+    except NotFound:
+        return None
+
+
+async def _get_sandbox_network() -> str:
+    """Return the network SSE sandbox containers join to be reachable by name.
+
+    docker-compose prefixes network names with the project name, so unless a
+    network is configured the one OpenManus itself is attached to is used.
+    """
+    if config.mcp_config.sandbox_network:
+        return config.mcp_config.sandbox_network
+    try:
+        container = await _get_own_container()
+    except Exception as e:
+        logger.warning(f"Failed to inspect the OpenManus container: {e}")
+        container = None
+    if container:
+        networks = container.attrs["NetworkSettings"]["Networks"]
+        if networks:
+            return next(iter(networks))
+    return SANDBOX_NETWORK
+
+
+class SandboxPool:
+    """A process-wide pool of long-lived sandbox containers.
+
+    Starting a container per MCP connection is slow, so stdio servers are
+    instead run with `docker exec` inside an idle pooled container, which is
+    returned to the pool on disconnect. Containers are started lazily, keyed
+    by command type (uvx/npx), up to `max_size` per type.
+
+    Pooled containers are labelled with the OpenManus instance and process
+    that started them. Before the first container is started, containers left
+    behind by a process of this instance that is gone (for example after a
+    crash or a restart of the core container) are stopped.
+
+    A `max_size` of 0 disables the pool.
+    """
+
+    def __init__(self, max_size: int = 4):
+        self.max_size = max_size
+        self._idle: Dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self._containers: Dict[str, List[str]] = defaultdict(list)
+        self._starting: Dict[str, int] = defaultdict(int)
+        self._releasing: Set[asyncio.Task] = set()
+        self._owner: Optional[str] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._reclaim_task: Optional[asyncio.Future] = None
+        atexit.register(self.shutdown)
+
+    def schedule_prewarm(self) -> None:
+        """Start pulling the sandbox images in the background, once per process.
+
+        Does nothing when called outside a running event loop.
+        """
+        if self._prewarm_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._prewarm_task = loop.create_task(self.prewarm())
+
+    async def prewarm(self) -> None:
+        """Pull the sandbox images that are missing locally.
+
+        This moves the image pull off the critical path of the first MCP
+        connection.
+        """
+        try:
+            client = await _get_docker_client()
+        except Exception as e:
+            logger.warning(f"Skipping sandbox prewarm, Docker is unavailable: {e}")
+            return
+
+        async def pull(image: str) -> None:
+            try:
+                await asyncio.to_thread(client.images.get, image)
+            except ImageNotFound:
+                logger.info(f"Pulling sandbox image: {image}")
+                await asyncio.to_thread(client.images.pull, image)
+
+        images = list(SANDBOX_IMAGES.values())
+        results = await asyncio.gather(
+            *(pull(image) for image in images), return_exceptions=True
+        )
+        for image, result in zip(images, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to pull sandbox image {image}: {result}")
+
+    async def acquire(self, command_type: str) -> Optional[str]:
+        """Take an idle container for the command type, starting one if needed.
+
+        Returns:
+            Optional[str]: The container ID, or None if the pool is exhausted
+            or the container could not be started
+        """
+        if command_type not in SANDBOX_IMAGES:
+            return None
+
+        try:
+            return self._idle[command_type].get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        size = len(self._containers[command_type]) + self._starting[command_type]
+        if size >= self.max_size:
+            return None
+
+        self._starting[command_type] += 1
+        try:
+            if self._reclaim_task is None:
+                self._reclaim_task = asyncio.ensure_future(self._reclaim_orphans())
+            await self._reclaim_task
+
+            client = await _get_docker_client()
+            container = await asyncio.to_thread(
+                client.containers.run,
+                SANDBOX_IMAGES[command_type],
+                "infinity",
+                entrypoint="sleep",
+                detach=True,
+                remove=True,
+                volumes=[
+                    *SANDBOX_CACHE_VOLUMES[command_type],
+                    f"{config.host_workspace_root}:/workspace",
+                ],
+                environment=SANDBOX_ENV_VARS,
+                labels={_POOL_LABEL: command_type, _OWNER_LABEL: self._owner},
+            )
+        except Exception as e:
+            logger.error(f"Failed to start pooled {command_type} container: {e}")
+            return None
+        finally:
+            self._starting[command_type] -= 1
+
+        logger.info(f"Started pooled {command_type} container: {container.id}")
+        self._containers[command_type].append(container.id)
+        return container.id
+
+    def release(self, command_type: str, container_id: str) -> None:
+        """Return a container to the pool once its MCP connection is closed.
+
+        Killing the `docker exec` CLI does not stop the server it started. The
+        server normally exits once its stdin is closed. Processes still running
+        after a grace period are killed, and if that fails the container is
+        stopped and dropped from the pool rather than shared with them. This
+        happens in the background, so disconnecting does not wait for it.
+        """
+        task = asyncio.get_running_loop().create_task(
+            self._return(command_type, container_id)
+        )
+        self._releasing.add(task)
+        task.add_done_callback(self._releasing.discard)
+
+    async def _return(self, command_type: str, container_id: str) -> None:
+        """Put the container back in the idle queue once no server is left in it."""
+        if await self._wait_until_idle(container_id):
+            self._idle[command_type].put_nowait(container_id)
+            return
+
+        logger.warning(f"Dropping pooled {command_type} container: {container_id}")
+        if container_id in self._containers[command_type]:
+            self._containers[command_type].remove(container_id)
+        await self._stop(container_id)
+
+    async def _wait_until_idle(self, container_id: str, timeout: float = 2.0) -> bool:
+        """Wait for all exec'd processes in the container to exit, killing stragglers.
+
+        Returns:
+            bool: True if no process other than the container init is left
+        """
+        try:
+            client = await _get_docker_client()
+            container = await asyncio.to_thread(client.containers.get, container_id)
+
+            pids = await self._wait_for_exit(container, timeout)
+            if not pids:
+                return True
+
+            logger.warning(
+                f"Killing leftover processes {pids} in pooled container {container_id}"
+            )
+            await asyncio.to_thread(
+                container.exec_run, ["sh", "-c", 'kill -9 "$@"', "sh", *pids]
+            )
+            return not await self._wait_for_exit(container, 1.0)
+        except Exception as e:
+            logger.warning(f"Failed to check pooled container {container_id}: {e}")
+            return False
+
+    async def _wait_for_exit(self, container, timeout: float) -> List[str]:
+        """Poll the container until only its init process runs, or timeout.
+
+        Returns:
+            List[str]: PIDs of the processes still running
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            _, output = await asyncio.to_thread(
+                container.exec_run, ["sh", "-c", _LIST_PROCESSES]
+            )
+            pids = output.decode().split()
+            if not pids or loop.time() >= deadline:
+                return pids
+            await asyncio.sleep(0.1)
+
+    async def _get_instance(self) -> str:
+        """Return a name for this OpenManus instance that survives restarts.
+
+        The hostname of a container is its ID, which changes whenever
+        docker-compose recreates it, so the container name is used instead.
+        """
+        try:
+            container = await _get_own_container()
+        except Exception as e:
+            logger.warning(f"Failed to inspect the OpenManus container: {e}")
+            container = None
+        return container.name if container else socket.gethostname()
+
+    async def _reclaim_orphans(self) -> None:
+        """Stop pooled containers whose owning process no longer exists."""
+        instance = await self._get_instance()
+        self._owner = f"{instance}:{os.getpid()}"
+        try:
+            client = await _get_docker_client()
+            containers = await asyncio.to_thread(
+                client.containers.list, filters={"label": _POOL_LABEL}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to list pooled containers: {e}")
+            return
+
+        for container in containers:
+            owner = container.labels.get(_OWNER_LABEL, "")
+            owner_instance, _, pid = owner.rpartition(":")
+            # Containers of another instance sharing this Docker daemon are not ours
+            if owner_instance and owner_instance != instance:
+                continue
+            # A restarted process can get the same PID as its predecessor, so
+            # unknown containers with our own PID are orphans as well
+            if pid.isdigit() and int(pid) != os.getpid() and _pid_alive(int(pid)):
+                continue
+            logger.info(f"Stopping orphaned pooled container: {container.id}")
+            await self._stop(container.id)
+
+    async def _stop(self, container_id: str) -> None:
+        """Stop a pooled container. It is removed on stop."""
+        try:
+            client = await _get_docker_client()
+            container = await asyncio.to_thread(client.containers.get, container_id)
+            await asyncio.to_thread(container.stop, timeout=1)
+        except Exception as e:
+            logger.warning(f"Failed to stop pooled container {container_id}: {e}")
+
+    def shutdown(self) -> None:
+        """Stop all pooled containers. They are removed on stop."""
+        if _DOCKER_CLIENT is None:
+            return
+        for container_ids in self._containers.values():
+            for container_id in container_ids:
+                try:
+                    _DOCKER_CLIENT.containers.get(container_id).stop(timeout=1)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to stop pooled container {container_id}: {e}"
+                    )
+        self._containers.clear()
+        self._idle.clear()
+
+
+SANDBOX_POOL = SandboxPool(max_size=config.mcp_config.sandbox_pool_size)
+
+
 class MCPToolCallSandboxHost:
     """A context manager for handling multiple MCP client connections.
 
@@ -26,6 +500,9 @@ class MCPToolCallSandboxHost:
         # Dictionary to store multiple client connections
         # key: client_id, value: MCPSandboxClients instance
         self.clients: Dict[str, MCPSandboxClients] = {}
+        # Pull the sandbox images ahead of the first connection, if enabled
+        if config.mcp_config.prewarm_sandbox_images:
+            SANDBOX_POOL.schedule_prewarm()
 
     async def add_sse_client(
         self, client_id: str, server_url: str
@@ -78,6 +555,88 @@ class MCPToolCallSandboxHost:
         self.clients[client_id] = client
         return client
 
+    async def add_stdio_client_as_sse(
+        self,
+        client_id: str,
+        command: str,
+        args: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        port: int = 8000,
+        timeout: float = 30.0,
+    ) -> "MCPSandboxClients":
+        """Run a uvx/npx MCP server as a long-lived SSE server and connect to it.
+
+        The container is started once in detached mode and reached by its
+        container name, so it joins the network of the OpenManus container, or
+        the configured `sandbox_network` if set. All tool calls reuse the
+        kept-alive SSE connection. The container is stopped when the client
+        disconnects.
+
+        Args:
+            client_id: Unique identifier for the client
+            command: Command to execute
+            args: List of command arguments, must start the server in SSE mode on `port`
+            env: Extra environment variables for the server
+            port: Port the server listens on inside the container
+            timeout: Seconds to wait for the server to accept connections
+
+        Returns:
+            MCPSandboxClients: The newly created sandboxed client instance
+
+        Raises:
+            ValueError: If client_id already exists or the command is not uvx/npx
+        """
+        if client_id in self.clients:
+            raise ValueError(f"Client ID '{client_id}' already exists")
+
+        client = MCPSandboxClients(client_id=client_id)
+        command_type = client._get_command_type(command)
+        if command_type not in SANDBOX_IMAGES:
+            raise ValueError(f"Unsupported command type for SSE sandbox: {command}")
+
+        docker_client = await _get_docker_client()
+        logger.info(f"Creating new SSE server container: {client.container_name}")
+        container = await asyncio.to_thread(
+            docker_client.containers.run,
+            SANDBOX_IMAGES[command_type],
+            [*shlex.split(command), *(args or [])],
+            name=client.container_name,
+            detach=True,
+            remove=True,
+            network=await _get_sandbox_network(),
+            volumes=[
+                *SANDBOX_CACHE_VOLUMES[command_type],
+                f"{config.host_workspace_root}:/workspace",
+            ],
+            environment={**SANDBOX_ENV_VARS, **(env or {})},
+        )
+
+        # The server needs a moment to start listening after the container
+        # starts. The container is only handed to the client once connected,
+        # as a failed attempt disconnects the client, which would stop it.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                try:
+                    await client.connect_sse(
+                        server_url=f"http://{client.container_name}:{port}/sse"
+                    )
+                    break
+                except Exception:
+                    if loop.time() >= deadline:
+                        raise
+                    await asyncio.sleep(0.5)
+        except BaseException:
+            # Also on cancellation, the detached container would outlive us
+            client.sse_container_id = container.id
+            await client.disconnect()
+            raise
+        client.sse_container_id = container.id
+
+        self.clients[client_id] = client
+        return client
+
     def get_client(self, client_id: str) -> Optional["MCPSandboxClients"]:
         """Retrieve a specific MCP client.
 
@@ -104,16 +663,20 @@ class MCPToolCallSandboxHost:
         return False
 
     async def disconnect_all(self) -> None:
-        """Disconnect all MCP client connections."""
-        client_ids = list(self.clients.keys())
-        # If the list is not reversed, there would be error when disconnecting the client.
-        # such like `Attempted to exit a cancel scope that isn't the current tasks's current cancel scope`
-        # I don't know why should reverse the list, but it works,
-        # if you know the reason, please let me know. Thanks!
-        # by author @iheytang
-        client_ids.reverse()
-        for client_id in client_ids:
-            await self.get_client(client_id).disconnect()
+        """Disconnect all MCP client connections concurrently.
+
+        Each client owns its connection in a dedicated task (see
+        MCPSandboxClients._run_session), so the order of disconnects no longer
+        matters and they can run in parallel.
+        """
+        clients = list(self.clients.items())
+        results = await asyncio.gather(
+            *(client.disconnect() for _, client in clients),
+            return_exceptions=True,
+        )
+        for (client_id, _), result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error disconnecting client {client_id}: {result}")
 
     def list_clients(self) -> List[str]:
         """Get a list of all client IDs.
@@ -131,12 +694,20 @@ class MCPToolCallSandboxHost:
         """
         return len(self.clients)
 
+    async def __aenter__(self) -> "MCPToolCallSandboxHost":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.disconnect_all()
+
 
 class MCPSandboxClientTool(BaseTool):
     """Represents a tool proxy that can be called on the MCP server from the client side, running in a sandbox."""
 
     session: Optional[ClientSession] = None
     client_id: str = ""
+    # Tool name on the MCP server, without the client_id prefix
+    server_tool_name: str = ""
 
     async def execute(self, **kwargs) -> ToolResult:
         """Execute the tool by making a remote call to the MCP server."""
@@ -144,14 +715,15 @@ class MCPSandboxClientTool(BaseTool):
             return ToolResult(error="Not connected to MCP server")
 
         try:
-            # Remove client_id prefix from tool name before calling server
-            server_tool_name = (
-                self.name[len(self.client_id) + 1 :] if self.client_id else self.name
-            )
-            result = await self.session.call_tool(server_tool_name, kwargs)
-            content_str = ", ".join(
-                item.text for item in result.content if isinstance(item, TextContent)
-            )
+            result = await self.session.call_tool(self.server_tool_name, kwargs)
+            content = result.content
+            # Most servers return a single text item, skip the join for it
+            if len(content) == 1 and type(content[0]) is TextContent:
+                content_str = content[0].text
+            else:
+                content_str = ", ".join(
+                    item.text for item in content if type(item) is TextContent
+                )
             return ToolResult(output=content_str or "No output returned.")
         except Exception as e:
             return ToolResult(error=f"Error executing tool: {str(e)}")
@@ -167,9 +739,20 @@ class MCPSandboxClients(ToolCollection):
     description: str = "MCP client tools running in container for server interaction"
     client_id: str = ""
 
+    # Task that owns the transport and session contexts, see _run_session
+    session_task: Optional[asyncio.Task] = None
+    closing: Optional[asyncio.Event] = None
+
     # Container management
     container_name: Optional[str] = None
     # source container name, it's OpenManus core container
+    # (command_type, container_id) of the pooled container in use, if any
+    pooled_container: Optional[Tuple[str, str]] = None
+    # Detached SSE server container owned by this client, if any
+    sse_container_id: Optional[str] = None
+    # Configuration and parameters of the last stdio connection, reused on
+    # reconnect so the parameters model is not validated again
+    server_params: Optional[Tuple[tuple, StdioServerParameters]] = None
 
     def __init__(self, client_id: str):
         super().__init__()  # Initialize with empty tools list
@@ -178,127 +761,61 @@ class MCPSandboxClients(ToolCollection):
         self.exit_stack = AsyncExitStack()
 
         # Always create a new container but use cached images
-        # Generate a container name with timestamp to ensure uniqueness
-        timestamp = int(time.time())
-        container_name = f"openmanus-sandbox-{timestamp}-{''.join(c if c.isalnum() else '-' for c in self.client_id)}"
-        self.container_name = container_name
+        # Generate a container name with a ns timestamp to ensure uniqueness
+        safe_client_id = _SANITIZE("-", self.client_id)
+        self.container_name = f"openmanus-sandbox-{time.time_ns():x}-{safe_client_id}"
 
     def _get_command_type(self, command: str) -> str:
         """Determine the type of command (uvx/npx/docker)."""
-        if command.startswith("uvx"):
-            return "uvx"
-        elif command.startswith("npx"):
-            return "npx"
-        elif command.startswith("docker"):
-            return "docker"
-        else:
-            raise ValueError(f"Unsupported command type: {command}")
+        try:
+            return _COMMAND_TYPES[command.split(None, 1)[0]]
+        except (KeyError, IndexError):
+            raise ValueError(f"Unsupported command type: {command}") from None
 
     def _convert_to_docker_command(
-        self, parameters: StdioServerParameters
+        self,
+        command: str,
+        args: List[str],
+        env: Dict[str, str],
+        pooled_container_id: Optional[str] = None,
     ) -> StdioServerParameters:
         """Convert any command to unified docker command format and return StdioServerParameters.
 
         Args:
-            command: The original command to execute
-            args: List of command arguments
+            command: The original command
+            args: The original command arguments
+            env: Extra environment variables for the server
+            pooled_container_id: Pooled container to `docker exec` into instead
+                of starting a new container
 
         Returns:
             StdioServerParameters: Parameters for stdio transport
         """
-        command_type = self._get_command_type(parameters.command)
-
-        # Build a unified docker command
-        docker_command = "docker"
+        command_type = self._get_command_type(command)
 
-        logger.info(f"Creating new container: {self.container_name}")
-
-        # For docker commands, use the original parameters directly
-        if command_type == "docker":
-            docker_args = ["run"]
-
-            if "--rm" not in parameters.args:
-                docker_args.append("--rm")
-            if "-i" not in parameters.args:
-                docker_args.append("-i")
-
-            docker_args.extend(["-v", f"{config.host_workspace_root}:/workspace"])
-            docker_args.extend([parameters.command, *parameters.args])
-
-            return StdioServerParameters(
-                command=docker_command,
-                args=docker_args,
-                env=parameters.env,
-            )
-
-        # Otherwise create a new container with --rm flag to ensure cleanup
-        docker_args = ["run", "--rm", "-i", "--name", self.container_name]
-
-        # Add volume mounts for package caches to persist between container runs
-        if command_type == "uvx":
-            # Map Python package cache directories
-            docker_args.extend(
-                [
-                    "-v",
-                    "openmanus-pip-cache:/root/.cache/pip",
-                    "-v",
-                    "openmanus-uv-cache:/root/.cache/uv",
-                ]
-            )
-        elif command_type == "npx":
-            # Map npm package cache directories
-            docker_args.extend(
-                [
-                    "-v",
-                    "openmanus-npm-cache:/root/.npm",
-                    "-v",
-                    "openmanus-yarn-cache:/usr/local/share/.cache/yarn",
-                ]
-            )
-
-        # Add workspace directory mount
-        docker_args.extend(["-v", f"{config.host_workspace_root}:/workspace"])
-
-        # Add environment variables to docker command
-        env_vars = {
-            "PYTHONUNBUFFERED": "1",  # Ensure Python output is not buffered
-            "TERM": "dumb",  # Use dumb terminal type
-            "PS1": "$ ",  # Set a simple prompt
-            "PROMPT_COMMAND": "",  # Disable prompt command
-            "UV_INDEX_URL": "https://mirrors.aliyun.com/pypi/simple/",
-            "NPM_REGISTRY": "https://registry.npmmirror.com",
-        }
-        for key, value in env_vars.items():
-            docker_args.extend(["-e", f"{key}={value}"])
-
-        # Add custom environment variables from parameters
-        for key, value in parameters.env.items():
-            docker_args.extend(["-e", f"{key}={value}"])
-
-        # Set different images and commands based on command type
-        if command_type == "uvx":
-            docker_args.extend(
-                [
-                    "iheytang/openmanus-sandbox-uvenv:latest",
-                    "bash",
-                    "-c",
-                    f"{parameters.command} {' '.join(parameters.args)}",
-                ]
-            )
-        elif command_type == "npx":
-            docker_args.extend(
-                [
-                    "iheytang/openmanus-sandbox-nodejs:latest",
-                    "bash",
-                    "-c",
-                    f"{parameters.command} {' '.join(parameters.args)}",
-                ]
-            )
-
-        return StdioServerParameters(
-            command=docker_command,
-            args=docker_args,
+        if pooled_container_id and command_type in SANDBOX_IMAGES:
+            logger.info(f"Using pooled container: {pooled_container_id}")
+        else:
+            logger.info(f"Creating new container: {self.container_name}")
+
+        args_key = tuple(args)
+        env_key = tuple(sorted(env.items()))
+        key = (command, args_key, env_key, pooled_container_id)
+        if self.server_params and self.server_params[0] == key:
+            return self.server_params[1]
+
+        server_params = _build_server_params(
+            command_type,
+            command,
+            args_key,
+            env_key,
+            self.container_name,
+            pooled_container_id,
+            str(config.host_workspace_root),
+            config.mcp_config.share_docker_package_caches,
         )
+        self.server_params = (key, server_params)
+        return server_params
 
     async def connect_stdio(
         self, command: str, args: List[str], env: Dict[str, str]
@@ -309,16 +826,22 @@ class MCPSandboxClients(ToolCollection):
         if self.session:
             await self.disconnect()
 
+        # Take a warm container from the pool when one is available
+        command_type = self._get_command_type(command)
+        container_id = await SANDBOX_POOL.acquire(command_type)
+        if container_id:
+            self.pooled_container = (command_type, container_id)
+
         # Convert to unified docker command parameters
         server_params = self._convert_to_docker_command(
-            StdioServerParameters(command=command, args=args, env=env)
+            command, args, env, container_id
         )
         # Use stdio_client provided by mcp library
         try:
-            s = await self.exit_stack.enter_async_context(stdio_client(server_params))
-            self.session = await self.exit_stack.enter_async_context(ClientSession(*s))
+            await self._start_session(stdio_client(server_params))
         except Exception as e:
             logger.error(f"Error creating stdio client {self.client_id}: {e}")
+            self._release_pooled_container()
             raise
 
         # Directly call the initialization method
@@ -331,10 +854,8 @@ class MCPSandboxClients(ToolCollection):
         if self.session:
             await self.disconnect()
 
-        # Use AsyncExitStack to manage async context
         try:
-            s = await self.exit_stack.enter_async_context(sse_client(url=server_url))
-            self.session = await self.exit_stack.enter_async_context(ClientSession(*s))
+            await self._start_session(sse_client(url=server_url))
         except Exception as e:
             logger.error(f"Error creating sse client {self.client_id}: {e}")
             raise
@@ -342,6 +863,46 @@ class MCPSandboxClients(ToolCollection):
         # Fetch available tools from MCP server
         await self._initialize_and_list_tools()
 
+    async def _start_session(self, transport) -> None:
+        """Start the task owning the connection and wait until the session is open."""
+        ready = asyncio.get_running_loop().create_future()
+        self.closing = asyncio.Event()
+        self.session_task = asyncio.create_task(self._run_session(transport, ready))
+        # Don't leave this waiting if the task dies with a BaseException such as
+        # CancelledError before the session opened, even before it first runs
+        self.session_task.add_done_callback(lambda _: ready.cancel())
+        try:
+            await ready
+        except BaseException:
+            self.closing.set()
+            self.session_task = None
+            raise
+
+    async def _run_session(self, transport, ready: asyncio.Future) -> None:
+        """Hold the transport and session contexts open until disconnect.
+
+        The mcp transports use anyio cancel scopes, which must be exited by the
+        same task that entered them. Giving every connection its own task keeps
+        that true no matter which task calls disconnect, so clients can be
+        disconnected concurrently.
+        """
+        try:
+            # Use AsyncExitStack to manage async context
+            async with self.exit_stack:
+                s = await self.exit_stack.enter_async_context(transport)
+                self.session = await self.exit_stack.enter_async_context(
+                    ClientSession(*s)
+                )
+                ready.set_result(None)
+                await self.closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"Error closing MCP client {self.client_id}: {e}")
+        finally:
+            self.session = None
+
     async def _initialize_and_list_tools(self) -> None:
         """Initialize session and populate tool map."""
         if not self.session:
@@ -359,38 +920,67 @@ class MCPSandboxClients(ToolCollection):
         logger.info("Fetching available tools from MCP server...")
         try:
             response = await self.session.list_tools()
-            logger.info(f"Received tool list response: {response}")
+            logger.debug("Received {} tools", len(response.tools))
 
-            # Clear existing tools
-            self.tools = tuple()
-            self.tool_map = {}
-
-            # Add client_id prefix to tool name
-            for tool in response.tools:
-                prefixed_name = f"{self.client_id}-{tool.name}"
-                server_tool = MCPSandboxClientTool(
-                    name=prefixed_name,
+            # Add client_id prefix to tool name and replace existing tools at once
+            tool_map = {
+                f"{self.client_id}-{tool.name}": MCPSandboxClientTool(
+                    name=f"{self.client_id}-{tool.name}",
                     description=tool.description,
                     parameters=tool.inputSchema,
                     session=self.session,
                     client_id=self.client_id,
+                    server_tool_name=tool.name,
                 )
-                self.tool_map[prefixed_name] = server_tool
-                logger.info(f"Added tool: {prefixed_name}")
-
-            self.tools = tuple(self.tool_map.values())
+                for tool in response.tools
+            }
+            self.tool_map = tool_map
+            self.tools = tuple(tool_map.values())
             logger.info(
-                f"Connected to server with tools (via container): {[tool.name for tool in response.tools]}"
+                "Connected to server with {} tools (via container): {}",
+                len(tool_map),
+                ", ".join(tool.name for tool in response.tools),
             )
         except Exception as e:
             logger.error(f"Failed to list tools: {e}")
             await self.disconnect()
             raise RuntimeError(f"Failed to list tools: {e}")
 
+    def _release_pooled_container(self) -> None:
+        """Return the pooled container, if any, to the sandbox pool."""
+        if self.pooled_container:
+            pooled_container, self.pooled_container = self.pooled_container, None
+            SANDBOX_POOL.release(*pooled_container)
+
     async def disconnect(self) -> None:
         """Disconnect from the MCP server and clean up resources."""
-        if self.session and self.exit_stack:
-            await self.exit_stack.aclose()
+        if self.session_task:
+            self.closing.set()
+            await self.session_task
+            self.session_task = None
             self.session = None
-            self.tools = tuple()
-            self.tool_map = {}
+            self.tools = _EMPTY
+            self.tool_map.clear()
+        self._release_pooled_container()
+        await self._stop_sse_container()
+
+    async def __aenter__(self) -> "MCPSandboxClients":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.disconnect()
+
+    async def _stop_sse_container(self) -> None:
+        """Stop the detached SSE server container, if any. It is removed on stop."""
+        if not self.sse_container_id:
+            return
+        try:
+            docker_client = await _get_docker_client()
+            container = await asyncio.to_thread(
+                docker_client.containers.get, self.sse_container_id
+            )
+            await asyncio.to_thread(container.stop, timeout=5)
+        except Exception as e:
+            logger.warning(f"Failed to stop SSE container {self.sse_container_id}: {e}")
+        finally:
+            self.sse_container_id = None
@@ -1,10 +1,9 @@
-from functools import partial
-import app
-from run_api import load_config
+def main():
+    # Imported here so importing this module does not load the API and agents
+    from run_api import main as run_api
 
+    run_api()
 
-if __name__ == "__main__":
-    import uvicorn
 
-    config = load_config()
-    uvicorn.run(app, host=config["host"], port=config["port"])
+if __name__ == "__main__":
+    main()
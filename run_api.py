@@ -1,88 +1,223 @@
-import os
-import threading
-import tomllib
-import webbrowser
-from functools import partial
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import ValidationError
 
 from app.apis import router
 
-app = FastAPI()
+# uvloop has no Windows support, fall back to the stock event loop there
+UVICORN_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+
+_VALIDATION_ERROR_PREFIX = (
+    b'{"code":400,"message":"Request parameter validation failed","errors":['
 )
 
-app.include_router(router)
 
+def format_validation_error(errors: list[Any]) -> bytes:
+    """Format validation error messages as a JSON response body"""
+    return (
+        _VALIDATION_ERROR_PREFIX
+        + b",".join(
+            orjson.dumps(
+                {"field": ".".join(map(str, error["loc"])), "message": error["msg"]}
+            )
+            for error in errors
+        )
+        + b"]}"
+    )
 
-def format_validation_error(errors: list[Any]) -> Dict[str, Any]:
-    """Format validation error messages"""
-    formatted_errors = []
-    for error in errors:
-        loc = ".".join(str(x) for x in error["loc"])
-        msg = error["msg"]
-        formatted_errors.append({"field": loc, "message": msg})
-    return {
-        "code": 400,
-        "message": "Request parameter validation failed",
-        "errors": formatted_errors,
-    }
+
+class ErrorHandlerASGI:
+    """Pure ASGI middleware that turns unhandled errors into JSON responses.
+
+    Pydantic validation errors become 400 responses and any other exception a
+    500 response. Errors raised after the response has started are re-raised,
+    as a new response can no longer be sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except ValidationError as exc:
+            if response_started:
+                raise
+            await _send_json(send, 400, format_validation_error(exc.errors()))
+        except Exception as exc:
+            if response_started:
+                raise
+            await _send_json(
+                send,
+                500,
+                orjson.dumps({"code": 500, "message": f"Server error: {str(exc)}"}),
+            )
+            # Let the server log the traceback, as Starlette does for 500s
+            raise
+
+
+async def _send_json(send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class CORSWildcardMiddleware:
+    """Pure ASGI CORS middleware that allows any origin, method and header.
+
+    Preflight requests are answered directly with precomputed headers. The
+    request origin is echoed back rather than `*`, since browsers reject a
+    wildcard origin on requests made with credentials.
+    """
+
+    def __init__(self, app, max_age: int = 600):
+        self.app = app
+        self.preflight_headers = [
+            (
+                b"access-control-allow-methods",
+                b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT",
+            ),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"vary", b"Origin"),
+        ]
+        self.simple_headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = [
+                (b"access-control-allow-origin", origin),
+                *self.preflight_headers,
+            ]
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send(
+                {"type": "http.response.start", "status": 204, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    *self.simple_headers,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Registered first so CORS headers are also added to error responses
+app.add_middleware(ErrorHandlerASGI)
+app.add_middleware(CORSWildcardMiddleware)
+# GZipMiddleware leaves text/event-stream responses uncompressed, so task events
+# are not held back in the gzip buffer
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+app.include_router(router)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_: Request, exc: RequestValidationError):
     """Handle request parameter validation errors"""
-    return JSONResponse(status_code=400, content=format_validation_error(exc.errors()))
-
-
-@app.exception_handler(ValidationError)
-async def pydantic_validation_exception_handler(_: Request, exc: ValidationError):
-    """Handle Pydantic model validation errors"""
-    return JSONResponse(status_code=400, content=format_validation_error(exc.errors()))
+    return Response(
+        content=format_validation_error(exc.errors()),
+        status_code=400,
+        media_type="application/json",
+    )
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(_: Request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"code": exc.status_code, "message": exc.detail},
     )
 
 
-@app.exception_handler(Exception)
-async def generic_exception_handler(_: Request, exc: Exception):
-    """Handle other exceptions"""
-    return JSONResponse(
-        status_code=500, content={"code": 500, "message": f"Server error: {str(exc)}"}
-    )
-
-
 def open_local_browser(config):
+    import webbrowser
+
     webbrowser.open_new_tab(
         f"http://{config.get('host', 'localhost')}:{config.get('port', 5172)}"
     )
 
 
+# Parsed server settings, keyed by config path and modification time
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+
 def load_config():
+    config_path = Path(__file__).parent / "config" / "config.toml"
     try:
-        config_path = Path(__file__).parent / "config" / "config.toml"
+        key = (str(config_path), config_path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return {"host": "localhost", "port": 5172}
+
+    if key not in _CONFIG_CACHE:
+        # Only the current version of the file is worth keeping
+        _CONFIG_CACHE.clear()
+        _CONFIG_CACHE[key] = _parse_config(config_path)
+    return _CONFIG_CACHE[key]
 
-        if not config_path.exists():
-            return {"host": "localhost", "port": 5172}
 
+def _parse_config(config_path: Path) -> Dict[str, Any]:
+    import tomllib
+
+    try:
         with open(config_path, "rb") as f:
             config = tomllib.load(f)
 
@@ -96,8 +231,13 @@ def load_config():
         return {"host": "localhost", "port": 5172}
 
 
-if __name__ == "__main__":
+def main():
+    """Serve the API with the host and port from config/config.toml"""
     import uvicorn
 
     config = load_config()
-    uvicorn.run(app, host=config["host"], port=config["port"])
+    uvicorn.run(app, host=config["host"], port=config["port"], loop=UVICORN_LOOP)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,8 @@ setup(
         "pillow>=10.4,<11.2",
         "browsergym~=0.13.3",
         "uvicorn~=0.34.0",
+        'uvloop~=0.21.0; sys_platform != "win32"',
+        "orjson~=3.10.15",
         "unidiff~=0.7.5",
         "browser-use~=0.1.40",
         "googlesearch-python~=1.3.0",
@@ -0,0 +1,136 @@
+"""Tests for the sandbox agent server and AgentSession.
+
+The agent server only depends on the standard library, so it is run in a
+thread on the host instead of inside a container.
+"""
+
+import socket
+import struct
+import threading
+
+import pytest
+import pytest_asyncio
+
+from app.sandbox.core.agent_server import AgentServer
+from app.sandbox.core.terminal import AgentSession
+
+
+@pytest.fixture
+def agent_socket(tmp_path):
+    """Fixture providing the socket path of a running agent server."""
+    socket_path = str(tmp_path / "agent.sock")
+    server = AgentServer(socket_path, str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def session(agent_socket):
+    """Fixture providing a connected AgentSession."""
+    session = AgentSession(agent_socket)
+    await session.create()
+    yield session
+    await session.close()
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        assert chunk, "server closed the connection"
+        data += chunk
+    return data
+
+
+def _request(sock, command):
+    """Sends one framed command and returns (return_code, stdout, stderr)."""
+    payload = command.encode()
+    sock.sendall(struct.pack("!I", len(payload)) + payload)
+    (return_code,) = struct.unpack("!i", _recv_exactly(sock, 4))
+    (stdout_len,) = struct.unpack("!I", _recv_exactly(sock, 4))
+    stdout = _recv_exactly(sock, stdout_len)
+    (stderr_len,) = struct.unpack("!I", _recv_exactly(sock, 4))
+    stderr = _recv_exactly(sock, stderr_len)
+    return return_code, stdout, stderr
+
+
+class TestAgentServer:
+    """Test cases for the agent server wire protocol."""
+
+    def test_framing(self, agent_socket):
+        """Test that several requests on one connection stay in sync."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(agent_socket)
+            assert _request(sock, "echo first") == (0, b"first\n", b"")
+            assert _request(sock, "printf ''") == (0, b"", b"")
+            assert _request(sock, "echo second") == (0, b"second\n", b"")
+
+    def test_large_output(self, agent_socket):
+        """Test output larger than a single socket read."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(agent_socket)
+            return_code, stdout, _ = _request(sock, "head -c 1000000 /dev/zero")
+            assert return_code == 0
+            assert stdout == b"\0" * 1000000
+
+    def test_exit_code_and_stderr(self, agent_socket):
+        """Test that the exit code and stderr are reported separately."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(agent_socket)
+            assert _request(sock, "echo out; echo err >&2; exit 3") == (
+                3,
+                b"out\n",
+                b"err\n",
+            )
+
+    def test_working_directory(self, agent_socket, tmp_path):
+        """Test that commands run in the server's working directory."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(agent_socket)
+            _, stdout, _ = _request(sock, "pwd")
+            assert stdout.decode().strip() == str(tmp_path)
+
+
+class TestAgentSession:
+    """Test cases for AgentSession."""
+
+    @pytest.mark.asyncio
+    async def test_execute(self, session):
+        """Test basic command execution."""
+        assert await session.execute("echo 'Hello World'") == "Hello World"
+
+    @pytest.mark.asyncio
+    async def test_stderr_included(self, session):
+        """Test that stderr is returned along with stdout."""
+        result = await session.execute("echo out; echo err >&2; exit 1")
+        assert "out" in result
+        assert "err" in result
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_timeout(self, session):
+        """Test that the session reconnects after a timed out command."""
+        with pytest.raises(TimeoutError):
+            await session.execute("sleep 1", timeout=0.1)
+        assert session.writer is None
+
+        assert await session.execute("echo recovered") == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_broken_connection(self, session):
+        """Test that the session reconnects after the connection broke."""
+        session.writer.transport.abort()
+        with pytest.raises(RuntimeError):
+            await session.execute("echo lost")
+        assert session.writer is None
+
+        assert await session.execute("echo recovered") == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_create_without_server(self, tmp_path):
+        """Test that create fails when no server is listening."""
+        session = AgentSession(str(tmp_path / "missing.sock"))
+        with pytest.raises(RuntimeError):
+            await session.create(timeout=0.2)
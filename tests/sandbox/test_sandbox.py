@@ -1,3 +1,5 @@
+import os
+
 import pytest
 import pytest_asyncio
 
@@ -137,6 +139,22 @@ async def test_sandbox_cleanup(sandbox_config):
     assert not any(c.id == container_id for c in containers)
 
 
+@pytest.mark.asyncio
+async def test_agent_server_sandbox_cleanup(sandbox_config):
+    """Tests that cleanup removes the agent server socket directory."""
+    sandbox = DockerSandbox(
+        sandbox_config.model_copy(update={"use_agent_server": True})
+    )
+    await sandbox.create()
+
+    result = await sandbox.run_command("echo 'agent'")
+    assert result.strip() == "agent"
+    socket_dir = sandbox.agent_socket_dir
+    await sandbox.cleanup()
+
+    assert not os.path.exists(socket_dir)
+
+
 @pytest.mark.asyncio
 async def test_sandbox_error_handling():
     """Tests error handling with invalid configuration."""
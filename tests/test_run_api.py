@@ -0,0 +1,78 @@
+"""Tests for the pure ASGI middlewares in run_api."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from run_api import CORSWildcardMiddleware, ErrorHandlerASGI
+
+ORIGIN = "http://localhost:3000"
+
+
+@pytest.fixture
+def client():
+    """Fixture providing a client for an app with run_api's middlewares."""
+    app = FastAPI()
+    # Same order as run_api, so error responses pass through the CORS layer
+    app.add_middleware(ErrorHandlerASGI)
+    app.add_middleware(CORSWildcardMiddleware)
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/error")
+    async def error():
+        raise RuntimeError("boom")
+
+    # The error is re-raised after the 500 is sent so the server can log it
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestCORSWildcardMiddleware:
+    """Test cases for CORSWildcardMiddleware."""
+
+    def test_preflight(self, client):
+        """Test that preflight requests are answered directly."""
+        response = client.options(
+            "/ok",
+            headers={
+                "Origin": ORIGIN,
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type",
+            },
+        )
+        assert response.status_code == 204
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert "POST" in response.headers["access-control-allow-methods"]
+        assert response.headers["access-control-allow-headers"] == "content-type"
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert response.headers["access-control-max-age"] == "600"
+
+    def test_simple_request(self, client):
+        """Test that simple requests get the CORS headers added."""
+        response = client.get("/ok", headers={"Origin": ORIGIN})
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert response.headers["vary"] == "Origin"
+
+    def test_request_without_origin(self, client):
+        """Test that requests without an Origin are left untouched."""
+        response = client.get("/ok")
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+
+class TestErrorHandlerASGI:
+    """Test cases for ErrorHandlerASGI."""
+
+    def test_server_error(self, client):
+        """Test that unhandled errors become JSON 500s with CORS headers."""
+        response = client.get("/error", headers={"Origin": ORIGIN})
+        assert response.status_code == 500
+        assert response.json() == {"code": 500, "message": "Server error: boom"}
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == str(len(response.content))
+        assert response.headers["access-control-allow-origin"] == ORIGIN
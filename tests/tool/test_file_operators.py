@@ -0,0 +1,34 @@
+"""Tests for the local file operator."""
+
+import pytest
+
+from app.tool.file_operators import LocalFileOperator
+
+
+@pytest.fixture
+def operator(tmp_path):
+    """Fixture providing a local file operator rooted at a temporary workspace."""
+    operator = LocalFileOperator()
+    operator.base_path = tmp_path
+    return operator
+
+
+class TestLocalFileOperator:
+    """Test cases for LocalFileOperator."""
+
+    @pytest.mark.asyncio
+    async def test_probe(self, operator, tmp_path):
+        """Test that probe reports existence and type in one call."""
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "file.txt").write_text("content")
+
+        assert await operator.probe("/workspace/dir") == (True, True)
+        assert await operator.probe("/workspace/file.txt") == (True, False)
+        assert await operator.probe("/workspace/missing") == (False, False)
+
+    @pytest.mark.asyncio
+    async def test_write_file_creates_parent_directories(self, operator, tmp_path):
+        """Test that writing a file creates its missing parent directories."""
+        await operator.write_file("/workspace/a/b/file.txt", "content")
+
+        assert (tmp_path / "a" / "b" / "file.txt").read_text() == "content"
@@ -0,0 +1,335 @@
+"""Tests for the sandboxed MCP clients, using a mocked Docker client."""
+
+import asyncio
+import os
+import socket
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from docker.errors import NotFound
+
+from app.config import config
+from app.tool import mcp_sandbox
+from app.tool.mcp_sandbox import (
+    MCPSandboxClients,
+    MCPToolCallSandboxHost,
+    SandboxPool,
+)
+
+NETWORK = "openmanus_openmanus-container-network"
+
+
+@pytest.fixture
+def docker_client(monkeypatch):
+    """Fixture providing the mocked Docker client shared by the sandbox clients."""
+    client = MagicMock()
+    client.containers.run.return_value.id = "sse-container"
+    client.containers.get.return_value.attrs = {
+        "NetworkSettings": {"Networks": {NETWORK: {}}}
+    }
+    monkeypatch.setattr(mcp_sandbox, "_DOCKER_CLIENT", client)
+    return client
+
+
+def _container(container_id, labels=None):
+    container = MagicMock(id=container_id, labels=labels or {})
+    container.name = container_id
+    container.exec_run.return_value = (0, b"")
+    return container
+
+
+@pytest.fixture
+def containers(docker_client):
+    """Fixture providing the containers of the mocked Docker daemon by ID.
+
+    OpenManus itself runs in the `openmanus-core` container.
+    """
+    containers = {socket.gethostname(): _container("openmanus-core")}
+
+    def get(container_id):
+        if container_id not in containers:
+            raise NotFound(container_id)
+        return containers[container_id]
+
+    def run(image, command, labels=None, **kwargs):
+        container = _container(f"pooled-{len(containers)}", labels)
+        containers[container.id] = container
+        return container
+
+    def list_containers(filters):
+        return [c for c in containers.values() if filters["label"] in c.labels]
+
+    docker_client.containers.get.side_effect = get
+    docker_client.containers.run.side_effect = run
+    docker_client.containers.list.side_effect = list_containers
+    return containers
+
+
+async def _released(pool):
+    await asyncio.gather(*pool._releasing)
+
+
+class FakeTransport:
+    """An MCP transport context manager that records its lifecycle."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.exited = False
+
+    async def __aenter__(self):
+        if self.error:
+            raise self.error
+        return "read", "write"
+
+    async def __aexit__(self, *exc_info):
+        self.exited = True
+
+
+class FakeClientSession:
+    """A ClientSession stand-in that does not talk to a server."""
+
+    def __init__(self, read, write):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+@pytest.fixture
+def connect_sse(monkeypatch):
+    """Fixture replacing the SSE connection of the sandbox clients."""
+    connect_sse = AsyncMock()
+    monkeypatch.setattr(MCPSandboxClients, "connect_sse", connect_sse)
+    return connect_sse
+
+
+class TestStdioClientAsSSE:
+    """Test cases for MCPToolCallSandboxHost.add_stdio_client_as_sse."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_connected(self, docker_client, connect_sse):
+        """Test that failed attempts while the server starts keep the container."""
+        connect_sse.side_effect = [RuntimeError("not listening"), None]
+        host = MCPToolCallSandboxHost()
+
+        client = await host.add_stdio_client_as_sse(
+            "fetch", "uvx", ["mcp-server-fetch"], port=8000
+        )
+
+        assert connect_sse.await_count == 2
+        assert client.sse_container_id == "sse-container"
+        assert host.get_client("fetch") is client
+        docker_client.containers.get.return_value.stop.assert_not_called()
+        _, kwargs = docker_client.containers.run.call_args
+        assert kwargs["network"] == NETWORK
+        assert kwargs["name"] == client.container_name
+
+    @pytest.mark.asyncio
+    async def test_stops_container_on_timeout(self, docker_client, connect_sse):
+        """Test that the container is stopped once the connection times out."""
+        connect_sse.side_effect = RuntimeError("not listening")
+        host = MCPToolCallSandboxHost()
+
+        with pytest.raises(RuntimeError):
+            await host.add_stdio_client_as_sse("fetch", "uvx", timeout=0)
+
+        docker_client.containers.get.assert_called_with("sse-container")
+        docker_client.containers.get.return_value.stop.assert_called_once()
+        assert host.get_client("fetch") is None
+
+    @pytest.mark.asyncio
+    async def test_stops_container_on_cancel(self, docker_client, connect_sse):
+        """Test that the container is stopped when the connection is cancelled."""
+        connect_sse.side_effect = asyncio.CancelledError()
+        host = MCPToolCallSandboxHost()
+
+        with pytest.raises(asyncio.CancelledError):
+            await host.add_stdio_client_as_sse("fetch", "uvx")
+
+        docker_client.containers.get.return_value.stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_configured_network(self, docker_client, connect_sse, monkeypatch):
+        """Test that a configured network takes precedence."""
+        monkeypatch.setattr(config.mcp_config, "sandbox_network", "custom")
+
+        await MCPToolCallSandboxHost().add_stdio_client_as_sse("fetch", "npx")
+
+        _, kwargs = docker_client.containers.run.call_args
+        assert kwargs["network"] == "custom"
+
+    @pytest.mark.asyncio
+    async def test_default_network_on_host(self, docker_client, connect_sse):
+        """Test the fallback network when OpenManus does not run in a container."""
+        docker_client.containers.get.side_effect = NotFound("no such container")
+
+        await MCPToolCallSandboxHost().add_stdio_client_as_sse("fetch", "uvx")
+
+        _, kwargs = docker_client.containers.run.call_args
+        assert kwargs["network"] == mcp_sandbox.SANDBOX_NETWORK
+
+    @pytest.mark.asyncio
+    async def test_unsupported_command(self, docker_client):
+        """Test that only uvx/npx servers can run as SSE servers."""
+        with pytest.raises(ValueError):
+            await MCPToolCallSandboxHost().add_stdio_client_as_sse(
+                "server", "docker", ["run", "image"]
+            )
+        docker_client.containers.run.assert_not_called()
+
+
+class TestSandboxPool:
+    """Test cases for SandboxPool."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_and_release(self, containers):
+        """Test that released containers are reused and the size is capped."""
+        pool = SandboxPool(max_size=1)
+
+        container_id = await pool.acquire("uvx")
+        assert container_id is not None
+        assert containers[container_id].labels == {
+            mcp_sandbox._POOL_LABEL: "uvx",
+            mcp_sandbox._OWNER_LABEL: f"openmanus-core:{os.getpid()}",
+        }
+        assert await pool.acquire("uvx") is None
+
+        pool.release("uvx", container_id)
+        await _released(pool)
+
+        assert await pool.acquire("uvx") == container_id
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, docker_client, containers):
+        """Test that a pool size of 0 never starts containers."""
+        pool = SandboxPool(max_size=0)
+
+        assert await pool.acquire("uvx") is None
+        docker_client.containers.run.assert_not_called()
+        docker_client.containers.list.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unsupported_command_type(self, docker_client, containers):
+        """Test that only uvx/npx containers are pooled."""
+        assert await SandboxPool().acquire("docker") is None
+        docker_client.containers.run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_release_drops_unchecked_container(self, containers):
+        """Test that a container that cannot be checked is stopped and dropped."""
+        pool = SandboxPool(max_size=1)
+        container_id = await pool.acquire("npx")
+        containers[container_id].exec_run.side_effect = RuntimeError("exec failed")
+
+        pool.release("npx", container_id)
+        await _released(pool)
+
+        containers[container_id].stop.assert_called_once()
+        new_container_id = await pool.acquire("npx")
+        assert new_container_id not in (None, container_id)
+
+    @pytest.mark.asyncio
+    async def test_reclaim_orphans(self, containers):
+        """Test that containers of dead processes of this instance are stopped."""
+        owners = {
+            # The core container was recreated and got a new hostname
+            "restarted": f"openmanus-core:{os.getpid()}",
+            "crashed": "openmanus-core:999999999",
+            "sibling": f"openmanus-core:{os.getppid()}",
+            "other-instance": "other-host:1",
+        }
+        for container_id, owner in owners.items():
+            containers[container_id] = _container(
+                container_id,
+                {mcp_sandbox._POOL_LABEL: "uvx", mcp_sandbox._OWNER_LABEL: owner},
+            )
+
+        await SandboxPool().acquire("uvx")
+
+        containers["restarted"].stop.assert_called_once()
+        containers["crashed"].stop.assert_called_once()
+        containers["sibling"].stop.assert_not_called()
+        containers["other-instance"].stop.assert_not_called()
+
+
+class TestSession:
+    """Test cases for the task owning an MCP connection."""
+
+    @pytest.fixture(autouse=True)
+    def client_session(self, monkeypatch):
+        monkeypatch.setattr(mcp_sandbox, "ClientSession", FakeClientSession)
+
+    @pytest.mark.asyncio
+    async def test_disconnect_from_another_task(self):
+        """Test that a connection can be closed by a task that did not open it."""
+        client = MCPSandboxClients("test")
+        transport = FakeTransport()
+
+        await asyncio.create_task(client._start_session(transport))
+        assert isinstance(client.session, FakeClientSession)
+
+        await asyncio.create_task(client.disconnect())
+        assert transport.exited
+        assert client.session is None
+        assert client.session_task is None
+
+    @pytest.mark.asyncio
+    async def test_transport_error(self):
+        """Test that transport errors are raised by _start_session."""
+        client = MCPSandboxClients("test")
+
+        with pytest.raises(ConnectionError):
+            await client._start_session(FakeTransport(ConnectionError("refused")))
+        assert client.session is None
+        assert client.session_task is None
+
+    @pytest.mark.asyncio
+    async def test_session_task_cancelled_before_ready(self):
+        """Test that _start_session does not hang if the session task dies early."""
+        client = MCPSandboxClients("test")
+        start = asyncio.create_task(client._start_session(FakeTransport()))
+        await asyncio.sleep(0)
+
+        # Cancelled before it first runs, so none of its code is executed
+        client.session_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(start, timeout=1)
+        assert client.session_task is None
+
+
+class TestDockerCommand:
+    """Test cases for MCPSandboxClients._convert_to_docker_command."""
+
+    def test_docker_args_untouched_by_default(self):
+        """Test that user-supplied docker servers get no cache mounts by default."""
+        params = MCPSandboxClients("test")._convert_to_docker_command(
+            "docker", ["run", "-i", "image"], {}
+        )
+        assert "openmanus-pip-cache:/root/.cache/pip" not in params.args
+
+    def test_shared_package_caches(self, monkeypatch):
+        """Test that the cache mounts are added when enabled."""
+        monkeypatch.setattr(config.mcp_config, "share_docker_package_caches", True)
+
+        params = MCPSandboxClients("test")._convert_to_docker_command(
+            "docker", ["run", "-i", "image"], {}
+        )
+
+        assert "openmanus-pip-cache:/root/.cache/pip" in params.args
+        assert "openmanus-npm-cache:/root/.npm" in params.args
+
+    def test_reconnect_reuses_parameters(self):
+        """Test that reconnecting with the same configuration reuses the model."""
+        client = MCPSandboxClients("test")
+
+        params = client._convert_to_docker_command("uvx", ["server"], {"KEY": "1"})
+        reconnect = client._convert_to_docker_command("uvx", ["server"], {"KEY": "1"})
+        changed = client._convert_to_docker_command("uvx", ["server"], {"KEY": "2"})
+
+        assert reconnect is params
+        assert changed is not params
+        assert params.args[:3] == ["run", "--name", client.container_name]
@@ -0,0 +1,26 @@
+"""Tests for the str_replace_editor tool."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.tool.str_replace_editor import StrReplaceEditor
+
+
+class TestView:
+    """Test cases for the view command."""
+
+    @pytest.mark.asyncio
+    async def test_view_probes_path_once(self):
+        """Test that view reuses the path type found during validation."""
+        operator = AsyncMock()
+        operator.probe.return_value = (True, True)
+        operator.run_command.return_value = (0, "/workspace/dir\n", "")
+        editor = StrReplaceEditor()
+        editor._get_operator = lambda: operator
+
+        result = await editor.execute(command="view", path="/workspace/dir")
+
+        assert "/workspace/dir" in result
+        operator.probe.assert_awaited_once_with("/workspace/dir")
+        operator.is_directory.assert_not_called()